@@ -3,6 +3,7 @@
 # Black Box Challenge - Python Implementation
 # This script takes three parameters and outputs the reimbursement amount
 # Usage: ./run.sh <trip_duration_days> <miles_traveled> <total_receipts_amount>
+#        ./run.sh --batch < cases.txt   (one "days miles receipts" triple per line)
 
 # Call the Python implementation - outputs only the number
-python3 calculate_reimbursement_final.py "$1" "$2" "$3"
+python3 calculate_reimbursement_final.py "$@"
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import sys
+import json
+
+from calculate_reimbursement_final import calculate_reimbursement_batch
+
+def load_cases(path):
+    """
+    Load test cases as parallel lists (days, miles, receipts, expected) rather
+    than a list of per-case dicts, so they can be handed to the batch API as-is.
+    """
+    with open(path) as f:
+        cases = json.load(f)
+
+    trip_durations = [case["input"]["trip_duration_days"] for case in cases]
+    miles = [case["input"]["miles_traveled"] for case in cases]
+    receipts = [case["input"]["total_receipts_amount"] for case in cases]
+    expected = [case["expected_output"] for case in cases]
+    return trip_durations, miles, receipts, expected
+
+def evaluate(path):
+    """
+    Score calculate_reimbursement against the cases in path in a single process,
+    reporting the same summary as eval.sh.
+    """
+    trip_durations, miles, receipts, expected = load_cases(path)
+    actual = calculate_reimbursement_batch(trip_durations, miles, receipts)
+    errors = [abs(a - e) for a, e in zip(actual, expected)]
+
+    num_cases = len(errors)
+    exact_matches = sum(1 for error in errors if error < 0.01)
+    close_matches = sum(1 for error in errors if error < 1.0)
+    avg_error = sum(errors) / num_cases
+    max_error = max(errors)
+
+    print("📈 Results Summary:")
+    print(f"  Total test cases: {num_cases}")
+    print(f"  Exact matches (±$0.01): {exact_matches} ({exact_matches * 100 / num_cases:.1f}%)")
+    print(f"  Close matches (±$1.00): {close_matches} ({close_matches * 100 / num_cases:.1f}%)")
+    print(f"  Average error: ${avg_error:.2f}")
+    print(f"  Maximum error: ${max_error:.2f}")
+    print()
+
+    # Calculate score (lower is better)
+    score = avg_error * 100 + (num_cases - exact_matches) * 0.1
+    print(f"🎯 Your Score: {score:.2f} (lower is better)")
+
+    if exact_matches < num_cases:
+        print()
+        print("  Check these high-error cases:")
+        worst = sorted(range(num_cases), key=errors.__getitem__, reverse=True)[:5]
+        for i in worst:
+            print(f"    Case {i + 1}: {trip_durations[i]} days, {miles[i]} miles, ${receipts[i]} receipts")
+            print(f"      Expected: ${expected[i]:.2f}, Got: ${actual[i]:.2f}, Error: ${errors[i]:.2f}")
+
+if __name__ == "__main__":
+    evaluate(sys.argv[1] if len(sys.argv) > 1 else "public_cases.json")